@@ -11,8 +11,8 @@ import re
 from datetime import datetime
 
 # Import our utilities
-from app.utils.pinecone_service import hybrid_search, initialize_pinecone_indexes
-from app.utils.cache_manager import CacheManager
+from app.utils.pinecone_service import hybrid_search, initialize_pinecone_indexes, compile_keywords
+from app.utils.cache_manager import CacheManager, stable_hash
 from app.utils.rate_limiter import RateLimiter
 from app.services.email_service import email_service
 from app.services.unified_chat_service import unified_chat_service
@@ -27,46 +27,46 @@ rate_limiter = RateLimiter()
 # Initialize OpenAI client
 openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Portfolio-related keywords
+PORTFOLIO_PATTERN = compile_keywords([
+    # Personal/Professional
+    "isaac", "you", "your", "yourself", "who are you", "tell me about",
+    
+    # Projects
+    "nutrivize", "echopod", "quizium", "signalflow", "project", "projects", "work", "built", "created",
+    
+    # Technical skills
+    "tech stack", "technology", "technologies", "programming", "coding", "development", "developer",
+    "react", "fastapi", "python", "javascript", "ai", "machine learning", "mongodb", "redis",
+    "framework", "library", "database", "api", "backend", "frontend", "full-stack",
+    
+    # Professional background
+    "experience", "background", "education", "skills", "abilities", "expertise", "career",
+    "work history", "professional", "resume", "cv", "qualifications", "achievements",
+    
+    # Contact/Business
+    "contact", "reach", "email", "hire", "opportunity", "available", "collaboration",
+    "freelance", "consulting", "services"
+])
+
+# Off-topic indicators (things clearly not about Isaac)
+OFF_TOPIC_PATTERN = compile_keywords([
+    "weather", "news", "politics", "sports", "movie", "recipe", "cooking", "travel",
+    "health advice", "medical", "legal advice", "financial advice", "investment",
+    "how to", "tutorial", "explain quantum", "what is the capital", "who won",
+    "current events", "celebrity", "entertainment", "joke", "funny", "meme"
+])
+
 def is_portfolio_related(text: str) -> bool:
     """Check if the question is related to Isaac's portfolio, projects, or professional background"""
     text_lower = text.lower()
     
-    # Portfolio-related keywords
-    portfolio_keywords = [
-        # Personal/Professional
-        "isaac", "you", "your", "yourself", "who are you", "tell me about",
-        
-        # Projects
-        "nutrivize", "echopod", "quizium", "signalflow", "project", "projects", "work", "built", "created",
-        
-        # Technical skills
-        "tech stack", "technology", "technologies", "programming", "coding", "development", "developer",
-        "react", "fastapi", "python", "javascript", "ai", "machine learning", "mongodb", "redis",
-        "framework", "library", "database", "api", "backend", "frontend", "full-stack",
-        
-        # Professional background
-        "experience", "background", "education", "skills", "abilities", "expertise", "career",
-        "work history", "professional", "resume", "cv", "qualifications", "achievements",
-        
-        # Contact/Business
-        "contact", "reach", "email", "hire", "opportunity", "available", "collaboration",
-        "freelance", "consulting", "services"
-    ]
-    
-    # Off-topic indicators (things clearly not about Isaac)
-    off_topic_indicators = [
-        "weather", "news", "politics", "sports", "movie", "recipe", "cooking", "travel",
-        "health advice", "medical", "legal advice", "financial advice", "investment",
-        "how to", "tutorial", "explain quantum", "what is the capital", "who won",
-        "current events", "celebrity", "entertainment", "joke", "funny", "meme"
-    ]
-    
     # Check for off-topic indicators first
-    if any(indicator in text_lower for indicator in off_topic_indicators):
+    if OFF_TOPIC_PATTERN.search(text_lower):
         return False
     
     # Check for portfolio-related content
-    return any(keyword in text_lower for keyword in portfolio_keywords)
+    return PORTFOLIO_PATTERN.search(text_lower) is not None
 
 def generate_redirect_response(question: str) -> str:
     """Generate a friendly response that redirects off-topic questions back to portfolio topics"""
@@ -118,6 +118,45 @@ Want to learn more about **Nutrivize** or Isaac's other **technical projects**?"
 
 What would you like to know about Isaac's **professional background** or **technical projects**?"""
 
+# Entity detection patterns, precompiled so each entity is a single regex scan
+PROJECT_ENTITY_PATTERNS = {
+    "nutrivize": compile_keywords(["nutrivize", "nutrition tracker", "food recognition", "health app"]),
+    "echopod": compile_keywords(["echopod", "podcast", "echo pod", "voice synthesis"]),
+    "quizium": compile_keywords(["quizium", "quiz", "flashcard", "study app"]),
+    "signalflow": compile_keywords(["signalflow", "signal flow", "trading", "ai trading"]),
+    "portfolio": compile_keywords(["portfolio", "this website", "this site", "personal website"])
+}
+
+TOPIC_ENTITY_PATTERNS = {
+    "tech_stack": compile_keywords(["tech stack", "technology", "technologies", "programming languages", "what tech", "built with", "tools used"]),
+    "experience": compile_keywords(["experience", "background", "career", "work history", "professional", "years", "how long"]),
+    "skills": compile_keywords(["skills", "abilities", "expertise", "proficient", "good at", "strengths", "capabilities"]),
+    "education": compile_keywords(["education", "degree", "university", "college", "school", "middlebury", "study"]),
+    "contact": compile_keywords(["contact", "reach", "email", "phone", "connect", "hire", "available"]),
+    "projects_overview": compile_keywords(["projects", "what built", "what made", "work on", "created", "developed"]),
+    "career_goals": compile_keywords(["looking for", "seeking", "job", "role", "position", "career goals", "next step"]),
+    "ai_experience": compile_keywords(["ai", "artificial intelligence", "machine learning", "ml", "openai", "gpt"]),
+    "architecture": compile_keywords(["architecture", "design", "structure", "how works", "system design"]),
+    "challenges": compile_keywords(["challenges", "difficult", "problems", "obstacles", "hard", "complex"]),
+    "learning": compile_keywords(["learn", "learning", "self taught", "education", "how did you", "start"]),
+    "deployment": compile_keywords(["deploy", "deployment", "hosting", "live", "production", "cloud"]),
+    "performance": compile_keywords(["performance", "speed", "fast", "optimization", "scalable"]),
+    "why_chosen": compile_keywords(["why", "choice", "reason", "decide", "choose", "picked"]),
+    "future_plans": compile_keywords(["future", "next", "plans", "roadmap", "upcoming", "working on"])
+}
+
+SKILL_ENTITY_PATTERNS = {
+    "react": compile_keywords(["react", "reactjs", "jsx", "hooks"]),
+    "python": compile_keywords(["python", "py", "django", "flask"]),
+    "fastapi": compile_keywords(["fastapi", "fast api", "api"]),
+    "javascript": compile_keywords(["javascript", "js", "node", "nodejs"]),
+    "ai": compile_keywords(["ai", "machine learning", "ml", "openai", "gpt", "llm"]),
+    "databases": compile_keywords(["database", "db", "mongodb", "mongo", "redis", "sql", "postgresql"]),
+    "frontend": compile_keywords(["frontend", "front-end", "ui", "ux", "css", "html", "tailwind"]),
+    "backend": compile_keywords(["backend", "back-end", "server", "api"]),
+    "cloud": compile_keywords(["cloud", "aws", "vercel", "render", "deployment"])
+}
+
 def extract_entities(text: str) -> Dict[str, List[str]]:
     """Extract entities and topics from user messages for context tracking"""
     entities = {
@@ -130,56 +169,18 @@ def extract_entities(text: str) -> Dict[str, List[str]]:
     text_lower = text.lower()
     
     # Projects
-    project_patterns = {
-        "nutrivize": ["nutrivize", "nutrition tracker", "food recognition", "health app"],
-        "echopod": ["echopod", "podcast", "echo pod", "voice synthesis"],
-        "quizium": ["quizium", "quiz", "flashcard", "study app"],
-        "signalflow": ["signalflow", "signal flow", "trading", "ai trading"],
-        "portfolio": ["portfolio", "this website", "this site", "personal website"]
-    }
-    
-    for project, keywords in project_patterns.items():
-        if any(keyword in text_lower for keyword in keywords):
+    for project, pattern in PROJECT_ENTITY_PATTERNS.items():
+        if pattern.search(text_lower):
             entities["projects"].append(project)
     
     # Detailed Topics for Better Response Targeting
-    topic_patterns = {
-        "tech_stack": ["tech stack", "technology", "technologies", "programming languages", "what tech", "built with", "tools used"],
-        "experience": ["experience", "background", "career", "work history", "professional", "years", "how long"],
-        "skills": ["skills", "abilities", "expertise", "proficient", "good at", "strengths", "capabilities"],
-        "education": ["education", "degree", "university", "college", "school", "middlebury", "study"],
-        "contact": ["contact", "reach", "email", "phone", "connect", "hire", "available"],
-        "projects_overview": ["projects", "what built", "what made", "work on", "created", "developed"],
-        "career_goals": ["looking for", "seeking", "job", "role", "position", "career goals", "next step"],
-        "ai_experience": ["ai", "artificial intelligence", "machine learning", "ml", "openai", "gpt"],
-        "architecture": ["architecture", "design", "structure", "how works", "system design"],
-        "challenges": ["challenges", "difficult", "problems", "obstacles", "hard", "complex"],
-        "learning": ["learn", "learning", "self taught", "education", "how did you", "start"],
-        "deployment": ["deploy", "deployment", "hosting", "live", "production", "cloud"],
-        "performance": ["performance", "speed", "fast", "optimization", "scalable"],
-        "why_chosen": ["why", "choice", "reason", "decide", "choose", "picked"],
-        "future_plans": ["future", "next", "plans", "roadmap", "upcoming", "working on"]
-    }
-    
-    for topic, keywords in topic_patterns.items():
-        if any(keyword in text_lower for keyword in keywords):
+    for topic, pattern in TOPIC_ENTITY_PATTERNS.items():
+        if pattern.search(text_lower):
             entities["topics"].append(topic)
     
     # Enhanced Skills Detection
-    skill_patterns = {
-        "react": ["react", "reactjs", "jsx", "hooks"],
-        "python": ["python", "py", "django", "flask"],
-        "fastapi": ["fastapi", "fast api", "api"],
-        "javascript": ["javascript", "js", "node", "nodejs"],
-        "ai": ["ai", "machine learning", "ml", "openai", "gpt", "llm"],
-        "databases": ["database", "db", "mongodb", "mongo", "redis", "sql", "postgresql"],
-        "frontend": ["frontend", "front-end", "ui", "ux", "css", "html", "tailwind"],
-        "backend": ["backend", "back-end", "server", "api"],
-        "cloud": ["cloud", "aws", "vercel", "render", "deployment"]
-    }
-    
-    for skill, keywords in skill_patterns.items():
-        if any(keyword in text_lower for keyword in keywords):
+    for skill, pattern in SKILL_ENTITY_PATTERNS.items():
+        if pattern.search(text_lower):
             entities["skills"].append(skill)
     
     return entities
@@ -302,7 +303,7 @@ async def chat_with_assistant_core(request: ChatRequest, client_ip: str = "unkno
     contextual_instructions = get_contextual_instructions(current_entities, session_data["messages"])
     
     # Check for cached response (30 minutes cache)
-    cache_key = f"{request.question}_{hash(str(session_data['entities']))}"
+    cache_key = f"{request.question}_{stable_hash(str(session_data['entities']))}"
     cached_response = await cache_manager.get_cached_response(cache_key)
     if cached_response and (time.time() - cached_response.get("timestamp", 0)) < 1800:
         # Update session with cached interaction
@@ -348,8 +349,9 @@ async def chat_with_assistant_core(request: ChatRequest, client_ip: str = "unkno
             if entities:
                 entity_context += f"- {entity_type}: {', '.join(entities)}\\n"
     
-    # Create enhanced prompt for GPT-4o with contextual awareness and strong guardrails
-    system_prompt = f"""You are Isaac Mineo's AI portfolio assistant. Your SOLE PURPOSE is to discuss Isaac's professional portfolio, projects, and technical expertise.
+    # Create enhanced prompt for GPT-4o with strong guardrails. The system prompt is identical for
+    # every request so the provider can cache it as a prefix; per-turn context goes in the user message.
+    system_prompt = """You are Isaac Mineo's AI portfolio assistant. Your SOLE PURPOSE is to discuss Isaac's professional portfolio, projects, and technical expertise.
 
 🚨 STRICT GUARDRAILS - MUST FOLLOW:
 1. ONLY respond to questions about:
@@ -411,8 +413,6 @@ async def chat_with_assistant_core(request: ChatRequest, client_ip: str = "unkno
 - Include timeline of skill development and how he stays current
 - Mention specific resources and methodologies used
 
-CONTEXTUAL INSTRUCTIONS: {contextual_instructions}
-
 Use markdown formatting extensively for better readability. Be thorough and informative while maintaining a conversational tone that reflects Isaac's personality and expertise. Include specific examples, technical details, and context from the knowledge base.
 
 For contact: isaacmineo@gmail.com"""
@@ -421,6 +421,8 @@ For contact: isaacmineo@gmail.com"""
 
 CONTEXT: {conversation_context}{entity_context}
 
+CONTEXTUAL INSTRUCTIONS: {contextual_instructions}
+
 QUESTION: {request.question}
 
 Provide a comprehensive, detailed response about Isaac. Be thorough and informative, using specific examples and concrete details from the knowledge base. 
@@ -10,6 +10,8 @@ import time
 from typing import Dict, Any, List
 import hashlib
 
+from app.utils.pinecone_service import semantic_search, IndexType
+
 class UltraFastSearchService:
     """Lightning-fast single-index search with embedding reuse and smart caching"""
     
@@ -17,6 +19,7 @@ class UltraFastSearchService:
         self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self._embedding_cache = {}  # Cache embeddings for reuse
         self._search_cache = {}     # Cache search results
+        self._fallback_cache = {}   # Cache fallback text by (query, complexity)
         
     async def create_embedding_cached(self, text: str) -> List[float]:
         """Create embedding with caching for reuse"""
@@ -59,8 +62,6 @@ class UltraFastSearchService:
         
         try:
             # Use ONLY semantic search on PROJECTS index for maximum speed
-            from app.utils.pinecone_service import semantic_search, IndexType
-            
             # Determine search parameters based on complexity
             if complexity == "simple":
                 top_k = 2  # Minimal results for speed
@@ -111,6 +112,20 @@ class UltraFastSearchService:
         """Ultra-fast fallback knowledge without any external calls"""
         query_lower = query.lower()
         
+        # Fallbacks are pure functions of the lowercased query, so repeats are a dict lookup
+        cache_key = (query_lower, complexity)
+        cached = self._fallback_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        fallback = self._build_fast_fallback(query_lower, complexity)
+        if len(self._fallback_cache) < 500:  # Limit cache size
+            self._fallback_cache[cache_key] = fallback
+        return fallback
+    
+    def _build_fast_fallback(self, query_lower: str, complexity: str) -> str:
+        """Pick the canned fallback text for a lowercased query"""
+        
         # Project-specific fallbacks
         if any(word in query_lower for word in ["nutrivize", "nutrition", "health", "ai nutrition"]):
             if complexity == "detailed":
@@ -13,7 +13,7 @@ from uuid import uuid4
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 
-from app.utils.cache_manager import CacheManager
+from app.utils.cache_manager import CacheManager, stable_hash
 from app.models.chat_models import ChatRequest, ChatResponse
 from app.services.ultra_fast_search import ultra_fast_search
 
@@ -259,7 +259,7 @@ Create detailed, professional responses with markdown formatting. Highlight tech
     async def _cache_response(self, session_id: str, question: str, response: str):
         """Cache response for future use"""
         try:
-            cache_key = f"chat_{session_id}_{hash(question)}"
+            cache_key = f"chat_{session_id}_{stable_hash(question)}"
             await self.cache_manager.set(
                 cache_key, 
                 {"question": question, "response": response, "timestamp": time.time()},
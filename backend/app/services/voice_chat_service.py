@@ -11,7 +11,7 @@ from uuid import uuid4
 from datetime import datetime
 
 from app.utils.pinecone_service import semantic_search, IndexType
-from app.utils.cache_manager import CacheManager
+from app.utils.cache_manager import CacheManager, stable_hash
 from app.routers.chatbot import ChatRequest, ChatResponse
 
 # Initialize services
@@ -47,7 +47,7 @@ async def voice_chat_response(request: ChatRequest) -> ChatResponse:
     session_id = request.sessionId or str(uuid4())
     
     # Quick cache check (5 minutes for voice)
-    cache_key = f"voice_{hash(request.question)}"
+    cache_key = f"voice_{stable_hash(request.question)}"
     cached_response = await cache_manager.get_cached_response(cache_key)
     if cached_response and (time.time() - cached_response.get("timestamp", 0)) < 300:  # 5 min cache
         return ChatResponse(
@@ -76,11 +76,8 @@ async def voice_chat_response(request: ChatRequest) -> ChatResponse:
         print(f"Voice search error: {e}")
         context_info = ""
     
-    # Create voice-optimized prompt
-    voice_prompt = f"""
-{VOICE_SYSTEM_PROMPT}
-
-Context (if relevant): {context_info[:300]}
+    # Create voice-optimized prompt; the static system prompt goes in its own message so it stays a cacheable prefix
+    voice_prompt = f"""Context (if relevant): {context_info[:300]}
 
 User question: {request.question}
 
@@ -90,7 +87,10 @@ Voice response (brief & conversational):"""
         # Use faster model and settings for voice
         response = openai_client.chat.completions.create(
             model="gpt-4o-mini",  # Faster model
-            messages=[{"role": "user", "content": voice_prompt}],
+            messages=[
+                {"role": "system", "content": VOICE_SYSTEM_PROMPT},
+                {"role": "user", "content": voice_prompt}
+            ],
             max_tokens=100,  # Limit response length
             temperature=0.7,
             timeout=10  # 10 second timeout
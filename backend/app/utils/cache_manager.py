@@ -1,9 +1,32 @@
 import redis
 import json
 import os
+import hashlib
 from typing import Optional, Dict, Any
 import time
 
+def stable_hash(text: str) -> str:
+    """Deterministic short digest for cache keys (built-in hash() is randomized per process)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+# One connection pool per Redis URL, shared by every CacheManager instance in the process
+_connection_pools: Dict[str, redis.ConnectionPool] = {}
+
+def get_connection_pool(redis_url: str) -> redis.ConnectionPool:
+    """Return the shared connection pool for a Redis URL, creating it on first use"""
+    pool = _connection_pools.get(redis_url)
+    if pool is None:
+        pool = redis.ConnectionPool.from_url(
+            redis_url,
+            decode_responses=True,
+            socket_timeout=10,
+            socket_connect_timeout=10,
+            retry_on_timeout=True,
+            health_check_interval=30
+        )
+        _connection_pools[redis_url] = pool
+    return pool
+
 class CacheManager:
     def __init__(self):
         self.redis_client = None
@@ -19,23 +42,16 @@ class CacheManager:
             print(f"Attempting Redis connection with URL: {redis_url[:50]}..." if redis_url else "No REDIS_URL found")
             
             if redis_url:
-                # Enhanced Redis connection with timeout and retry settings
-                self.redis_client = redis.from_url(
-                    redis_url, 
-                    decode_responses=True,
-                    socket_timeout=10,
-                    socket_connect_timeout=10,
-                    retry_on_timeout=True,
-                    health_check_interval=30
-                )
-                # Test connection
-                ping_result = self.redis_client.ping()
+                # Enhanced Redis connection with timeout and retry settings, on the shared pool
+                self.redis_client = redis.Redis(connection_pool=get_connection_pool(redis_url))
+                # Test connection and basic operations in a single round-trip
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.ping()
+                pipe.set("test:connection", "success", ex=60)
+                pipe.get("test:connection")
+                ping_result, _, test_result = pipe.execute()
                 self.connected = True
                 print(f"✅ Connected to Redis successfully - Ping: {ping_result}")
-                
-                # Test basic operations
-                self.redis_client.set("test:connection", "success", ex=60)
-                test_result = self.redis_client.get("test:connection")
                 print(f"✅ Redis operations test: {test_result}")
                 
             else:
@@ -80,7 +96,7 @@ class CacheManager:
         """Get cached response for a cache key"""
         try:
             if self.redis_client:
-                cache_redis_key = f"response:{hash(cache_key)}"
+                cache_redis_key = f"response:{stable_hash(cache_key)}"
                 data = self.redis_client.get(cache_redis_key)
                 return json.loads(data) if data else None
             return None
@@ -92,7 +108,7 @@ class CacheManager:
         """Cache a response"""
         try:
             if self.redis_client:
-                cache_redis_key = f"response:{hash(cache_key)}"
+                cache_redis_key = f"response:{stable_hash(cache_key)}"
                 cache_data = {
                     "response": response,
                     "timestamp": time.time(),
@@ -6,6 +6,10 @@ from typing import Optional, List, Dict, Any, Tuple
 import hashlib
 import json
 import re
+import asyncio
+import random
+import time
+import traceback
 from enum import Enum
 
 # Import knowledge service
@@ -36,6 +40,12 @@ INDEX_CONFIGS = {
 pc = None
 openai_client = None
 
+# Index handles are reused across requests so their HTTP connection pools stay warm
+_index_handles = {}
+
+# Set once the indexes have been checked this process, so repeat calls skip the list/create round-trips
+_indexes_initialized = False
+
 def initialize_clients():
     """Initialize Pinecone and OpenAI clients"""
     global pc, openai_client
@@ -53,14 +63,61 @@ def initialize_clients():
         raise ValueError("OPENAI_API_KEY environment variable not set")
         
     if openai_client is None:
-        openai_client = openai.OpenAI(api_key=openai_key)
+        # Retries (including connection errors and timeouts) are handled by _call_with_retry,
+        # so the SDK's own retries are disabled to avoid multiplying attempts
+        openai_client = openai.OpenAI(api_key=openai_key, max_retries=0)
+
+def get_index(index_name: str):
+    """Return a cached Pinecone Index handle, creating it on first use"""
+    index = _index_handles.get(index_name)
+    if index is None:
+        index = pc.Index(index_name)
+        _index_handles[index_name] = index
+    return index
+
+# Same statuses the OpenAI SDK retries by default: request timeout, conflict, rate limit and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+def _call_with_retry(func, *args, max_attempts: int = 6, base_delay: float = 0.1, max_delay: float = 10.0, **kwargs):
+    """
+    Call a blocking Pinecone or OpenAI operation, retrying rate limits, server errors and OpenAI
+    connection failures/timeouts with exponential backoff and jitter. Honors Retry-After (capped at max_delay) when the error
+    carries it; other errors are re-raised. Sleeps in the calling thread, so async code must
+    run it through asyncio.to_thread.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as error:
+            status = getattr(error, 'status', None) or getattr(error, 'status_code', None)
+            # APIConnectionError (and its APITimeoutError subclass) carries no status
+            retryable = status in RETRYABLE_STATUS_CODES or isinstance(error, openai.APIConnectionError)
+            if not retryable or attempt == max_attempts:
+                raise
+            
+            # Pinecone errors carry headers directly, OpenAI errors on their response
+            headers = getattr(error, 'headers', None) or getattr(getattr(error, 'response', None), 'headers', None) or {}
+            retry_after = headers.get('Retry-After') or headers.get('retry-after')
+            try:
+                delay = min(max_delay, float(retry_after))
+            except (TypeError, ValueError):
+                delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+                delay = random.uniform(delay / 2, delay)
+            
+            print(f"⚠️ Request failed ({status or type(error).__name__}), retrying in {delay:.2f}s (attempt {attempt}/{max_attempts})")
+            time.sleep(delay)
 
 async def initialize_pinecone_indexes():
     """Initialize all Pinecone indexes if they don't exist"""
+    global _indexes_initialized
+    
     try:
         # Initialize clients first
         initialize_clients()
         
+        if _indexes_initialized:
+            return {index_type: get_index(INDEX_CONFIGS[index_type]["name"]) for index_type in IndexType}
+        
         existing_indexes = pc.list_indexes()
         index_names = [index.name for index in existing_indexes] if existing_indexes else []
         
@@ -88,7 +145,8 @@ async def initialize_pinecone_indexes():
         if created_indexes:
             print(f"Successfully created {len(created_indexes)} new indexes")
         
-        return {index_type: pc.Index(INDEX_CONFIGS[index_type]["name"]) for index_type in IndexType}
+        _indexes_initialized = True
+        return {index_type: get_index(INDEX_CONFIGS[index_type]["name"]) for index_type in IndexType}
         
     except Exception as error:
         print(f"Error initializing Pinecone indexes: {error}")
@@ -100,8 +158,10 @@ async def create_embedding(text: str) -> List[float]:
         # Ensure clients are initialized
         initialize_clients()
         
-        # Create embedding with the best OpenAI model
-        response = openai_client.embeddings.create(
+        # Create embedding with the best OpenAI model, off the event loop so retry backoff can't block it
+        response = await asyncio.to_thread(
+            _call_with_retry,
+            openai_client.embeddings.create,
             model="text-embedding-3-large",
             input=text.replace("\n", " "),
             dimensions=3072  # Use full dimension for best quality
@@ -111,42 +171,60 @@ async def create_embedding(text: str) -> List[float]:
         print(f"Error creating embedding: {error}")
         raise error
 
+async def create_embeddings_batch(texts: List[str]) -> List[List[float]]:
+    """Create embeddings for several texts with a single OpenAI request"""
+    if not texts:
+        return []
+    try:
+        initialize_clients()
+        
+        # Run off the event loop so retry backoff can't block it
+        response = await asyncio.to_thread(
+            _call_with_retry,
+            openai_client.embeddings.create,
+            model="text-embedding-3-large",
+            input=[text.replace("\n", " ") for text in texts],
+            dimensions=3072
+        )
+        # Keep output aligned with the input order
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+    except Exception as error:
+        print(f"Error creating embeddings batch: {error}")
+        raise error
+
+def compile_keywords(keywords: List[str]) -> "re.Pattern[str]":
+    """Compile keywords into one alternation that matches any of them as a substring"""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+# Query classification keywords, precompiled so each category is a single regex scan
+PROJECT_QUERY_PATTERN = compile_keywords([
+    'project', 'code', 'github', 'repository', 'application', 'app', 'build', 'develop',
+    'nutrivize', 'quizium', 'echopodcast', 'ai', 'fastapi', 'react', 'python', 'javascript',
+    'technology', 'stack', 'framework', 'api', 'database', 'feature', 'implementation'
+])
+
+PROFESSIONAL_QUERY_PATTERN = compile_keywords([
+    'resume', 'cv', 'experience', 'work', 'job', 'career', 'skill', 'education', 'university',
+    'degree', 'qualification', 'employment', 'professional', 'background', 'expertise'
+])
+
+PERSONAL_QUERY_PATTERN = compile_keywords([
+    'about', 'personal', 'hobby', 'interest', 'contact', 'email', 'phone', 'location',
+    'personality', 'background', 'story', 'life', 'passion', 'goal', 'aspiration'
+])
+
 def classify_query(query: str) -> List[IndexType]:
     """Classify query to determine which indexes to search"""
     query_lower = query.lower()
     
-    # Technical/project keywords
-    project_keywords = [
-        'project', 'code', 'github', 'repository', 'application', 'app', 'build', 'develop',
-        'nutrivize', 'quizium', 'echopodcast', 'ai', 'fastapi', 'react', 'python', 'javascript',
-        'technology', 'stack', 'framework', 'api', 'database', 'feature', 'implementation'
-    ]
-    
-    # Professional keywords  
-    professional_keywords = [
-        'resume', 'cv', 'experience', 'work', 'job', 'career', 'skill', 'education', 'university',
-        'degree', 'qualification', 'employment', 'professional', 'background', 'expertise'
-    ]
-    
-    # Personal keywords
-    personal_keywords = [
-        'about', 'personal', 'hobby', 'interest', 'contact', 'email', 'phone', 'location',
-        'personality', 'background', 'story', 'life', 'passion', 'goal', 'aspiration'
-    ]
-    
-    # Score each category
-    project_score = sum(1 for keyword in project_keywords if keyword in query_lower)
-    professional_score = sum(1 for keyword in professional_keywords if keyword in query_lower)
-    personal_score = sum(1 for keyword in personal_keywords if keyword in query_lower)
-    
     # Determine which indexes to search
     indexes_to_search = []
     
-    if project_score > 0:
+    if PROJECT_QUERY_PATTERN.search(query_lower):
         indexes_to_search.append(IndexType.PROJECTS)
-    if professional_score > 0:
+    if PROFESSIONAL_QUERY_PATTERN.search(query_lower):
         indexes_to_search.append(IndexType.PROFESSIONAL)
-    if personal_score > 0:
+    if PERSONAL_QUERY_PATTERN.search(query_lower):
         indexes_to_search.append(IndexType.PERSONAL)
     
     # If no specific category detected, search all indexes
@@ -155,8 +233,9 @@ def classify_query(query: str) -> List[IndexType]:
     
     return indexes_to_search
 
-async def semantic_search(query: str, index_type: IndexType, top_k: int = 3) -> List[Dict[str, Any]]:
-    """Perform semantic vector search on specific index"""
+async def semantic_search(query: str, index_type: IndexType, top_k: int = 3,
+                          query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+    """Perform semantic vector search on specific index, reusing query_embedding when provided"""
     try:
         initialize_clients()
         
@@ -164,10 +243,11 @@ async def semantic_search(query: str, index_type: IndexType, top_k: int = 3) ->
             raise ValueError("Pinecone client not initialized")
             
         index_name = INDEX_CONFIGS[index_type]["name"]
-        index = pc.Index(index_name)
+        index = get_index(index_name)
         
-        # Create embedding for the query
-        query_embedding = await create_embedding(query)
+        # Create embedding for the query unless the caller already has one
+        if query_embedding is None:
+            query_embedding = await create_embedding(query)
         
         # Search for similar vectors
         search_results = index.query(
@@ -194,27 +274,31 @@ async def semantic_search(query: str, index_type: IndexType, top_k: int = 3) ->
         
     except Exception as error:
         print(f"Error in semantic search for {index_type.value}: {error}")
-        import traceback
         traceback.print_exc()
         return []
 
-async def keyword_search(query: str, index_type: IndexType, top_k: int = 3) -> List[Dict[str, Any]]:
-    """Perform keyword-based search using metadata filtering"""
+async def keyword_search(query: str, index_type: IndexType, top_k: int = 3,
+                         keyword_embeddings: Optional[List[List[float]]] = None) -> List[Dict[str, Any]]:
+    """
+    Perform keyword-based search using metadata filtering
+    keyword_embeddings, when provided, must line up with extract_keywords(query)
+    """
     try:
         initialize_clients()
         index_name = INDEX_CONFIGS[index_type]["name"]
-        index = pc.Index(index_name)
+        index = get_index(index_name)
         
         # Extract keywords from query
         keywords = extract_keywords(query)
         
+        # Embed all keywords in one request rather than one round-trip per keyword
+        if keyword_embeddings is None:
+            keyword_embeddings = await create_embeddings_batch(keywords)
+        
         results = []
         
         # Search for each keyword
-        for keyword in keywords:
-            # Create a simple embedding for keyword matching
-            keyword_embedding = await create_embedding(keyword)
-            
+        for keyword, keyword_embedding in zip(keywords, keyword_embeddings):
             # Search with keyword filter if metadata supports it
             search_results = index.query(
                 vector=keyword_embedding,
@@ -223,11 +307,12 @@ async def keyword_search(query: str, index_type: IndexType, top_k: int = 3) -> L
                 include_values=False
             )
             
+            # Keywords are already lowercased by extract_keywords; only the match text needs folding
             for match in search_results.matches:
-                content = match.metadata.get('text', '').lower()
-                if keyword.lower() in content:
+                content = match.metadata.get('text', '')
+                if keyword in content.lower():
                     results.append({
-                        'content': match.metadata.get('text', ''),
+                        'content': content,
                         'source': match.metadata.get('source', ''),
                         'score': match.score + 0.1,  # Boost for keyword match
                         'index_type': index_type.value,
@@ -248,16 +333,17 @@ async def keyword_search(query: str, index_type: IndexType, top_k: int = 3) -> L
         print(f"Error in keyword search for {index_type.value}: {error}")
         return []
 
+# Stop words and word pattern for keyword extraction, built once at import
+KEYWORD_STOP_WORDS = frozenset({'what', 'how', 'when', 'where', 'why', 'who', 'is', 'are', 'was', 'were', 
+                                'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
+                                'of', 'with', 'by', 'can', 'could', 'does', 'do', 'tell', 'me', 'about'})
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
 def extract_keywords(query: str) -> List[str]:
     """Extract meaningful keywords from query"""
-    # Remove common stop words
-    stop_words = {'what', 'how', 'when', 'where', 'why', 'who', 'is', 'are', 'was', 'were', 
-                  'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                  'of', 'with', 'by', 'can', 'could', 'does', 'do', 'tell', 'me', 'about'}
-    
     # Extract words, remove punctuation, filter stop words
-    words = re.findall(r'\b\w+\b', query.lower())
-    keywords = [word for word in words if word not in stop_words and len(word) > 2]
+    words = WORD_PATTERN.findall(query.lower())
+    keywords = [word for word in words if word not in KEYWORD_STOP_WORDS and len(word) > 2]
     
     return keywords[:5]  # Limit to most important keywords
 
@@ -272,14 +358,19 @@ async def hybrid_search(query: str, top_k: int = 8) -> str:
         
         all_results = []
         
+        # The query and its keywords are the same for every index, so embed them once in a single batch
+        keywords = extract_keywords(query)
+        embeddings = await create_embeddings_batch([query] + keywords)
+        query_embedding, keyword_embeddings = embeddings[0], embeddings[1:]
+        
         # Search each relevant index
         for index_type in relevant_indexes:
             # Semantic search
-            semantic_results = await semantic_search(query, index_type, top_k//2)
+            semantic_results = await semantic_search(query, index_type, top_k//2, query_embedding)
             all_results.extend(semantic_results)
             
             # Keyword search
-            keyword_results = await keyword_search(query, index_type, top_k//2)
+            keyword_results = await keyword_search(query, index_type, top_k//2, keyword_embeddings)
             all_results.extend(keyword_results)
         
         # Fusion ranking: combine and re-rank results
@@ -357,12 +448,15 @@ def get_fallback_knowledge() -> str:
     """Fallback knowledge when vector search fails"""
     return knowledge_service.get_fallback_knowledge()
 
+# Concurrent upsert requests per call, kept low to stay inside Pinecone's rate limits
+UPSERT_CONCURRENCY = 4
+
 async def upsert_vectors(vectors: List[Dict[str, Any]], index_type: IndexType) -> bool:
     """Upsert vectors to specific Pinecone index"""
     try:
         initialize_clients()
         index_name = INDEX_CONFIGS[index_type]["name"]
-        index = pc.Index(index_name)
+        index = get_index(index_name)
         
         # Format vectors for upsert
         formatted_vectors = []
@@ -373,11 +467,18 @@ async def upsert_vectors(vectors: List[Dict[str, Any]], index_type: IndexType) -
                 'metadata': vector['metadata']
             })
         
-        # Upsert in batches
+        # Upsert in batches, a few in flight at once so per-batch round-trips overlap
         batch_size = 100
-        for i in range(0, len(formatted_vectors), batch_size):
-            batch = formatted_vectors[i:i + batch_size]
-            index.upsert(vectors=batch)
+        semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+        
+        async def upsert_batch(batch: List[Dict[str, Any]]):
+            async with semaphore:
+                await asyncio.to_thread(_call_with_retry, index.upsert, vectors=batch)
+        
+        await asyncio.gather(*(
+            upsert_batch(formatted_vectors[i:i + batch_size])
+            for i in range(0, len(formatted_vectors), batch_size)
+        ))
         
         print(f"Upserted {len(formatted_vectors)} vectors to {index_name}")
         return True
@@ -392,11 +493,18 @@ async def get_all_index_stats() -> Dict[str, Any]:
         all_stats = {}
         total_vectors = 0
         
-        for index_type in IndexType:
-            index_name = INDEX_CONFIGS[index_type]["name"]
+        # Fetch stats for every index concurrently instead of one round-trip at a time
+        index_names = [INDEX_CONFIGS[index_type]["name"] for index_type in IndexType]
+        results = await asyncio.gather(
+            # Resolve the handle inside the thread so one bad index only fails its own entry
+            *(asyncio.to_thread(lambda name=index_name: get_index(name).describe_index_stats()) for index_name in index_names),
+            return_exceptions=True
+        )
+        
+        for index_name, stats in zip(index_names, results):
             try:
-                index = pc.Index(index_name)
-                stats = index.describe_index_stats()
+                if isinstance(stats, Exception):
+                    raise stats
                 
                 index_stats = {
                     'total_vectors': stats.total_vector_count,
@@ -40,10 +40,7 @@ def test_env_variables():
             'REDIS_URL'
         ]
         
-        missing_vars = []
-        for var in required_vars:
-            if not os.getenv(var):
-                missing_vars.append(var)
+        missing_vars = [var for var in required_vars if not os.getenv(var)]
         
         if missing_vars:
             print(f"❌ Missing environment variables: {missing_vars}")
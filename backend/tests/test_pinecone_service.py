@@ -0,0 +1,106 @@
+"""
+Unit tests for Pinecone service helpers
+Uses in-memory fakes so no Pinecone or OpenAI access is needed
+"""
+
+import pytest
+import httpx
+import openai
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.pinecone_service import _call_with_retry
+
+
+class FakeAPIError(Exception):
+    """Error shaped like the Pinecone/OpenAI exceptions the retry helper inspects"""
+    
+    def __init__(self, status=None, status_code=None, headers=None):
+        super().__init__(f"HTTP {status or status_code}")
+        self.status = status
+        self.status_code = status_code
+        self.headers = headers
+
+
+class FlakyCall:
+    """Callable that raises the given errors in order, then returns 'ok'"""
+    
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+    
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class TestCallWithRetry:
+    """Test suite for the rate-limit retry helper"""
+    
+    @patch("app.utils.pinecone_service.time.sleep")
+    def test_retries_rate_limit_then_succeeds(self, mock_sleep):
+        """A 429 carried on .status is retried"""
+        call = FlakyCall(FakeAPIError(status=429))
+        
+        assert _call_with_retry(call) == "ok"
+        assert call.calls == 2
+        assert mock_sleep.call_count == 1
+    
+    @patch("app.utils.pinecone_service.time.sleep")
+    def test_reads_status_code_attribute(self, mock_sleep):
+        """OpenAI-style errors expose the status as .status_code"""
+        call = FlakyCall(FakeAPIError(status_code=503), FakeAPIError(status_code=429))
+        
+        assert _call_with_retry(call) == "ok"
+        assert call.calls == 3
+    
+    @patch("app.utils.pinecone_service.time.sleep")
+    def test_retries_openai_connection_errors(self, mock_sleep):
+        """Dropped connections and timeouts have no status but are still retried"""
+        request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+        call = FlakyCall(openai.APIConnectionError(request=request), openai.APITimeoutError(request=request))
+        
+        assert _call_with_retry(call) == "ok"
+        assert call.calls == 3
+        assert mock_sleep.call_count == 2
+    
+    @patch("app.utils.pinecone_service.time.sleep")
+    def test_honors_retry_after_header(self, mock_sleep):
+        """Retry-After from the error headers sets the wait"""
+        call = FlakyCall(FakeAPIError(status=429, headers={"Retry-After": "2"}))
+        
+        _call_with_retry(call)
+        mock_sleep.assert_called_once_with(2.0)
+    
+    @patch("app.utils.pinecone_service.time.sleep")
+    def test_caps_retry_after_at_max_delay(self, mock_sleep):
+        """A long Retry-After cannot stall the caller beyond max_delay"""
+        call = FlakyCall(FakeAPIError(status=429, headers={"Retry-After": "3600"}))
+        
+        _call_with_retry(call, max_delay=5.0)
+        mock_sleep.assert_called_once_with(5.0)
+    
+    @patch("app.utils.pinecone_service.time.sleep")
+    def test_non_retryable_status_raises_immediately(self, mock_sleep):
+        """Client errors such as 400 are not retried"""
+        call = FlakyCall(FakeAPIError(status=400))
+        
+        with pytest.raises(FakeAPIError):
+            _call_with_retry(call)
+        assert call.calls == 1
+        mock_sleep.assert_not_called()
+    
+    @patch("app.utils.pinecone_service.time.sleep")
+    def test_gives_up_after_max_attempts(self, mock_sleep):
+        """The last retryable error is re-raised once attempts run out"""
+        call = FlakyCall(*(FakeAPIError(status=429) for _ in range(3)))
+        
+        with pytest.raises(FakeAPIError):
+            _call_with_retry(call, max_attempts=3)
+        assert call.calls == 3
+        assert mock_sleep.call_count == 2
@@ -29,6 +29,26 @@ print_error() {
     echo -e "${RED}[ERROR]${NC} $1"
 }
 
+# Export KEY=VALUE lines from an env file literally, without running it as shell code
+load_env_file() {
+    local line key value
+    while IFS= read -r line || [ -n "$line" ]; do
+        line="${line%$'\r'}"
+        case "$line" in ''|'#'*) continue ;; esac
+        [[ "$line" == *=* ]] || continue
+        key="${line%%=*}"
+        value="${line#*=}"
+        key="${key#export }"
+        key="${key//[[:space:]]/}"
+        [[ "$key" =~ ^[A-Za-z_][A-Za-z0-9_]*$ ]] || continue
+        # Strip one pair of matching surrounding quotes
+        if [[ "$value" =~ ^\"(.*)\"$ || "$value" =~ ^\'(.*)\'$ ]]; then
+            value="${BASH_REMATCH[1]}"
+        fi
+        export "$key=$value"
+    done < "$1"
+}
+
 # Check if we're in the project root
 if [ ! -f "package.json" ] && [ ! -f "backend/requirements.txt" ]; then
     print_error "Please run this script from the project root directory"
@@ -42,7 +62,7 @@ print_status "Setting up test environment..."
 
 # Load environment variables for testing
 if [ -f ".env.test" ]; then
-    export $(cat .env.test | grep -v '#' | awk '/=/ {print $1}')
+    load_env_file .env.test
     print_success "Loaded test environment variables"
 else
     print_warning "No .env.test file found, using development environment"
@@ -184,16 +204,30 @@ cd backend
 source venv/bin/activate
 
 # Start server in background
-python -m uvicorn app.main:app --host 0.0.0.0 --port 8001 &
+python -m uvicorn app.main:app --host 0.0.0.0 --port 8001 --loop uvloop --http httptools --no-access-log &
 BACKEND_PID=$!
 
-# Wait for server to start
-sleep 5
+# Wait for server to start: poll /health with exponential backoff (50ms doubling to 500ms, 30s max)
+BACKEND_READY=false
+POLL_DELAY=0.05
+POLL_DEADLINE=$((SECONDS + 30))
+while [ $SECONDS -lt $POLL_DEADLINE ]; do
+    if curl -sf --max-time 1 http://localhost:8001/health &> /dev/null; then
+        BACKEND_READY=true
+        break
+    fi
+    # Stop waiting if the server process already exited
+    if ! kill -0 $BACKEND_PID 2>/dev/null; then
+        break
+    fi
+    sleep $POLL_DELAY
+    POLL_DELAY=$(awk -v d="$POLL_DELAY" 'BEGIN { d *= 2; print (d > 0.5) ? 0.5 : d }')
+done
 
 cd ..
 
 # Check if server is responding
-if curl -f http://localhost:8001/health &> /dev/null; then
+if [ "$BACKEND_READY" = "true" ]; then
     print_success "Backend server started successfully"
     
     # Run integration tests
@@ -14,6 +14,26 @@ NC='\033[0m' # No Color
 
 echo -e "${BLUE}🚀 Isaac Mineo Portfolio - Starting Backend${NC}"
 
+# Export KEY=VALUE lines from an env file literally, without running it as shell code
+load_env_file() {
+    local line key value
+    while IFS= read -r line || [ -n "$line" ]; do
+        line="${line%$'\r'}"
+        case "$line" in ''|'#'*) continue ;; esac
+        [[ "$line" == *=* ]] || continue
+        key="${line%%=*}"
+        value="${line#*=}"
+        key="${key#export }"
+        key="${key//[[:space:]]/}"
+        [[ "$key" =~ ^[A-Za-z_][A-Za-z0-9_]*$ ]] || continue
+        # Strip one pair of matching surrounding quotes
+        if [[ "$value" =~ ^\"(.*)\"$ || "$value" =~ ^\'(.*)\'$ ]]; then
+            value="${BASH_REMATCH[1]}"
+        fi
+        export "$key=$value"
+    done < "$1"
+}
+
 # Navigate to project root
 cd "$(dirname "$0")/.."
 
@@ -30,7 +50,7 @@ source venv/bin/activate
 # Load environment variables from centralized .env
 if [ -f ".env" ]; then
     echo -e "${YELLOW}🔧 Loading environment variables...${NC}"
-    export $(cat .env | grep -v '^#' | grep -v '^$' | xargs)
+    load_env_file .env
 fi
 
 # Install/upgrade dependencies
@@ -4,13 +4,19 @@ Test script for enhanced AI portfolio chat responses
 Tests common questions that recruiters and developers ask
 """
 
-import requests
+import aiohttp
+import asyncio
 import json
 import time
+import heapq
 from typing import List, Dict, Optional
 
 # Configuration
 API_URL = "http://localhost:8000/api/chatbot"
+HEALTH_URL = "http://localhost:8000/health"
+MAX_CONCURRENT_REQUESTS = 8
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_RATE_LIMIT_DELAY = 10.0
 TEST_QUESTIONS = [
     # Tech Stack Questions (Enhanced)
     "What's your tech stack?",
@@ -57,9 +63,21 @@ TEST_QUESTIONS = [
     "What's the tech stack?",  # Should understand this refers to Nutrivize
 ]
 
-def test_ai_response(question: str, session_id: Optional[str] = None) -> Dict:
+# The last questions are a context-aware follow-up pair and must run in order on one session
+FOLLOW_UP_COUNT = 2
+
+def rate_limit_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait after a 429: the server's Retry-After if given, else exponential backoff"""
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = 2 ** attempt
+    return min(delay, MAX_RATE_LIMIT_DELAY)
+
+async def test_ai_response(http: aiohttp.ClientSession, question: str, session_id: Optional[str] = None) -> Dict:
     """Test a single question and return response details"""
-    print(f"\n🤔 Question: {question}")
+    # Requests run concurrently, so each question's output is printed as one block
+    lines = [f"\n🤔 Question: {question}"]
     
     payload = {
         "question": question,
@@ -67,86 +85,107 @@ def test_ai_response(question: str, session_id: Optional[str] = None) -> Dict:
     }
     
     try:
-        start_time = time.time()
-        response = requests.post(API_URL, json=payload, timeout=30)
-        end_time = time.time()
-        
-        if response.status_code == 200:
-            data = response.json()
-            response_time = end_time - start_time
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            start_time = time.time()
+            async with http.post(API_URL, json=payload) as response:
+                if response.status == 429 and attempt < MAX_RATE_LIMIT_RETRIES:
+                    # Back off only when the server pushes back, honoring Retry-After when it's short
+                    delay = rate_limit_delay(response.headers.get("Retry-After"), attempt)
+                    lines.append(f"⏳ Rate limited, retrying in {delay:.1f}s")
+                elif response.status == 200:
+                    data = await response.json()
+                    response_time = time.time() - start_time
+                    
+                    lines.append(f"✅ Response received ({response_time:.2f}s)")
+                    lines.append(f"📝 Length: {len(data['response'])} characters")
+                    lines.append(f"🔍 Method: {data.get('searchMethod', 'unknown')}")
+                    lines.append(f"💬 Session: {data.get('sessionId', 'none')}")
+                    
+                    # Show first 200 chars of response
+                    response_preview = data['response'][:200] + "..." if len(data['response']) > 200 else data['response']
+                    lines.append(f"📄 Preview: {response_preview}")
+                    
+                    return {
+                        "success": True,
+                        "question": question,
+                        "response": data['response'],
+                        "response_time": response_time,
+                        "method": data.get('searchMethod'),
+                        "session_id": data.get('sessionId'),
+                        "length": len(data['response'])
+                    }
+                else:
+                    lines.append(f"❌ HTTP {response.status}: {await response.text()}")
+                    return {"success": False, "question": question, "error": f"HTTP {response.status}"}
             
-            print(f"✅ Response received ({response_time:.2f}s)")
-            print(f"📝 Length: {len(data['response'])} characters")
-            print(f"🔍 Method: {data.get('searchMethod', 'unknown')}")
-            print(f"💬 Session: {data.get('sessionId', 'none')}")
-            
-            # Show first 200 chars of response
-            response_preview = data['response'][:200] + "..." if len(data['response']) > 200 else data['response']
-            print(f"📄 Preview: {response_preview}")
-            
-            return {
-                "success": True,
-                "question": question,
-                "response": data['response'],
-                "response_time": response_time,
-                "method": data.get('searchMethod'),
-                "session_id": data.get('sessionId'),
-                "length": len(data['response'])
-            }
-        else:
-            print(f"❌ HTTP {response.status_code}: {response.text}")
-            return {"success": False, "error": f"HTTP {response.status_code}"}
+            # Sleep after the response is released so the pooled connection can be reused
+            await asyncio.sleep(delay)
             
-    except requests.exceptions.Timeout:
-        print(f"⏰ Timeout after 30 seconds")
-        return {"success": False, "error": "Timeout"}
+    except asyncio.TimeoutError:
+        lines.append(f"⏰ Timeout after 30 seconds")
+        return {"success": False, "question": question, "error": "Timeout"}
     except Exception as e:
-        print(f"💥 Error: {e}")
-        return {"success": False, "error": str(e)}
+        lines.append(f"💥 Error: {e}")
+        return {"success": False, "question": question, "error": str(e)}
+    finally:
+        print("\n".join(lines))
 
-def run_enhanced_ai_tests():
+async def run_enhanced_ai_tests(http: aiohttp.ClientSession):
     """Run comprehensive tests of enhanced AI responses"""
     print("🚀 ENHANCED AI PORTFOLIO CHAT TEST")
     print("=" * 50)
     
-    results = []
-    session_id = None
+    independent_questions = TEST_QUESTIONS[:-FOLLOW_UP_COUNT]
+    follow_up_questions = TEST_QUESTIONS[-FOLLOW_UP_COUNT:]
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def bounded_test(question: str) -> Dict:
+        async with semaphore:
+            return await test_ai_response(http, question)
     
-    for i, question in enumerate(TEST_QUESTIONS, 1):
-        print(f"\n--- Test {i}/{len(TEST_QUESTIONS)} ---")
-        result = test_ai_response(question, session_id)
+    # Context-free questions fan out in parallel; gather keeps results in question order
+    results = list(await asyncio.gather(*(bounded_test(question) for question in independent_questions)))
+    
+    # Follow-ups run serially and share a session ID for context-aware testing
+    session_id = None
+    for question in follow_up_questions:
+        result = await test_ai_response(http, question, session_id)
         results.append(result)
         
-        # Use session ID for context-aware testing
         if result.get("success") and result.get("session_id"):
             session_id = result["session_id"]
-        
-        # Brief pause between requests
-        time.sleep(1)
     
     # Summary
     print("\n" + "=" * 50)
     print("📊 TEST SUMMARY")
     print("=" * 50)
     
-    successful = [r for r in results if r.get("success")]
-    failed = [r for r in results if not r.get("success")]
+    # Partition results and accumulate totals in a single pass
+    successful = []
+    failed = []
+    total_response_time = 0.0
+    total_length = 0
+    methods = {}
+    for result in results:
+        if not result.get("success"):
+            failed.append(result)
+            continue
+        successful.append(result)
+        total_response_time += result['response_time']
+        total_length += result['length']
+        method = result.get('method', 'unknown')
+        methods[method] = methods.get(method, 0) + 1
     
     print(f"✅ Successful: {len(successful)}/{len(results)}")
     print(f"❌ Failed: {len(failed)}/{len(results)}")
     
     if successful:
-        avg_response_time = sum(r['response_time'] for r in successful) / len(successful)
-        avg_length = sum(r['length'] for r in successful) / len(successful)
+        avg_response_time = total_response_time / len(successful)
+        avg_length = total_length / len(successful)
         print(f"⚡ Avg Response Time: {avg_response_time:.2f}s")
         print(f"📏 Avg Response Length: {avg_length:.0f} characters")
     
     # Show methods used
-    methods = {}
-    for result in successful:
-        method = result.get('method', 'unknown')
-        methods[method] = methods.get(method, 0) + 1
-    
     print(f"🔍 Methods Used: {methods}")
     
     if failed:
@@ -157,22 +196,31 @@ def run_enhanced_ai_tests():
     # Highlight best responses
     if successful:
         print(f"\n🏆 LONGEST RESPONSES:")
-        sorted_by_length = sorted(successful, key=lambda x: x['length'], reverse=True)[:3]
-        for result in sorted_by_length:
+        longest = heapq.nlargest(3, successful, key=lambda x: x['length'])
+        for result in longest:
             print(f"   • {result['question']}: {result['length']} chars")
 
+async def main():
+    connector = aiohttp.TCPConnector(limit=16, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        # Check if backend is running
+        try:
+            async with http.get(HEALTH_URL, timeout=aiohttp.ClientTimeout(total=5)) as health_check:
+                healthy = health_check.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            print("❌ Backend is not running. Please start it with: ./start-backend.sh")
+            return
+        
+        if healthy:
+            print("✅ Backend is running, starting tests...")
+            await run_enhanced_ai_tests(http)
+        else:
+            print("❌ Backend health check failed")
+
 if __name__ == "__main__":
     print("Testing Enhanced AI Portfolio Chat...")
     print("Make sure the backend is running on localhost:8000")
     print()
     
-    # Check if backend is running
-    try:
-        health_check = requests.get("http://localhost:8000/health", timeout=5)
-        if health_check.status_code == 200:
-            print("✅ Backend is running, starting tests...")
-            run_enhanced_ai_tests()
-        else:
-            print("❌ Backend health check failed")
-    except requests.exceptions.RequestException:
-        print("❌ Backend is not running. Please start it with: ./start-backend.sh")
+    asyncio.run(main())